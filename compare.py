@@ -1,6 +1,13 @@
-import json
+import hashlib
+import httpx
+import mmap
 import os
-import requests
+import orjson
+import sys
+import threading
+import time
+import zstandard as zstd
+from concurrent.futures import ThreadPoolExecutor
 from deepdiff import DeepDiff
 from swagger_spec_validator.validator20 import validate_spec
 from swagger_spec_validator.common import SwaggerValidationError
@@ -9,85 +16,366 @@ from urllib.parse import urlparse
 
 cur_spec = 'current'
 diff = 'differences'
+index_filename = '.index.jsonl'  # Индекс сохраненных снимков: {"ts", "sha", "path"} на строку
+request_timeout = 30  # Таймаут HTTP-запроса в секундах
+max_workers = 16  # Количество одновременно загружаемых URL
+stream_chunk_size = 64 * 1024  # Размер блока при потоковом чтении ответа
+# Списки Swagger, порядок элементов в которых не имеет значения
+unordered_keys = frozenset({'parameters', 'tags', 'required', 'enum', 'security', 'schemes', 'consumes', 'produces'})
+
+# Общий клиент с пулом соединений для всех потоков загрузки; по HTTP/2 запросы
+# к одному хосту мультиплексируются в одном TLS-соединении
+http_client = httpx.Client(
+    http2=True,
+    timeout=request_timeout,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    follow_redirects=True,
+)
+
+_validated_hashes = set()  # sha256 содержимого спецификаций, успешно прошедших проверку
+_known_dirs = set()  # Каталоги, уже созданные или проверенные в этом процессе
+_claimed_timestamps = set()  # (каталог, префикс, метка), уже закрепленные за URL в этом процессе
+_claim_lock = threading.Lock()
+# Фоновая проверка спецификаций, совмещаемая с чтением предыдущих снимков
+_validator_executor = ThreadPoolExecutor(max_workers=2)
+
+def meta_path_for(spec_path):
+    """Возвращает путь к файлу метаданных HTTP-ответа рядом с сохраненной спецификацией."""
+    return spec_path[:-len('.json')] + '.meta.json'
+
+
+def save_meta(spec_path, meta):
+    """Сохраняет метаданные HTTP-ответа рядом со спецификацией spec_path."""
+    with open(meta_path_for(spec_path), 'wb') as file:
+        file.write(orjson.dumps(meta, option=orjson.OPT_INDENT_2))
+
+
+def refresh_meta(spec_path, meta):
+    """Обновляет ETag и Last-Modified снимка spec_path, если сервер прислал новые для того же содержимого.
+
+    Без этого при пропуске сохранения снимка условные запросы продолжали бы отправлять
+    устаревшие валидаторы и каждый раз скачивать тело целиком.
+    """
+    if 'etag' not in meta and 'last_modified' not in meta:
+        return  # Спецификация загружена из файла, HTTP-валидаторов нет
+    cached_meta = load_meta(spec_path) or {}
+    updated_meta = dict(
+        cached_meta,
+        url=meta.get('url'),
+        etag=meta.get('etag'),
+        last_modified=meta.get('last_modified'),
+        sha256=meta['sha256'],
+    )
+    if updated_meta != cached_meta:
+        save_meta(spec_path, updated_meta)
+
+
+def load_meta(spec_path):
+    """Загружает метаданные HTTP-ответа (URL, ETag, Last-Modified, sha256) для сохраненной спецификации."""
+    try:
+        with open(meta_path_for(spec_path), 'rb') as file:
+            return orjson.loads(file.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return None
+
+
+def validate_spec_cached(spec, content_hash):
+    """Проверяет спецификацию Swagger, пропуская содержимое, уже проверенное в этом процессе.
+
+    validate_spec дописывает в объекты $ref ключи x-scope, поэтому проверяется копия:
+    сохраняемая и сравниваемая спецификация не зависит от того, была ли проверка пропущена.
+    """
+    if content_hash in _validated_hashes:
+        return
+    validate_spec(orjson.loads(orjson.dumps(spec)))
+    _validated_hashes.add(content_hash)
+
 
-def load_spec(file_path_or_url):
-    """Загружает спецификацию из JSON файла или URL."""
+def warm_up_validator():
+    """Однократно прогревает валидатор Swagger на минимальной спецификации.
+
+    swagger_spec_validator загружает и кэширует метасхему Swagger 2.0 при первом вызове;
+    прогрев до запуска потоков не дает каждому из них разбирать ее одновременно.
+    """
+    validate_spec({'swagger': '2.0', 'info': {'title': '', 'version': ''}, 'paths': {}})
+
+
+def load_spec(file_path_or_url, client=None, cached_spec_path=None, validate=True):
+    """Загружает спецификацию из JSON файла или URL (через общий или переданный HTTP-клиент).
+
+    Возвращает кортеж (спецификация, метаданные): sha256 содержимого, а для URL еще сам URL,
+    ETag и Last-Modified. Для URL выполняется условный запрос по метаданным cached_spec_path,
+    если снимок получен по тому же URL: при ответе 304 возвращается сохраненная копия. При validate=False проверку спецификации
+    выполняет вызывающий код (validate_spec_cached с sha256 из метаданных).
+    """
+    client = client or http_client
     try:
         if file_path_or_url.startswith('http://') or file_path_or_url.startswith('https://'):
-            response = requests.get(file_path_or_url)
-            response.raise_for_status()
-            response.encoding = 'utf-8'  # Устанавливаем кодировку
+            cached_meta = load_meta(cached_spec_path) if cached_spec_path else None
+            if cached_meta and cached_meta.get('url') != file_path_or_url:
+                # URL с общим каталогом по умолчанию делят снимки: валидаторы и хэш
+                # чужого ответа к этому URL неприменимы
+                cached_meta = None
+            headers = {}
+            if cached_meta and cached_meta.get('etag'):
+                headers['If-None-Match'] = cached_meta['etag']
+            if cached_meta and cached_meta.get('last_modified'):
+                headers['If-Modified-Since'] = cached_meta['last_modified']
+            with client.stream('GET', file_path_or_url, headers=headers) as response:
+                if response.status_code == 304:
+                    # Спецификация не изменилась: берем сохраненную копию, она уже проверялась
+                    with open(cached_spec_path, 'rb') as file:
+                        spec = orjson.loads(file.read())
+                    _validated_hashes.add(cached_meta['sha256'])
+                    return spec, cached_meta
+                response.raise_for_status()
+                # Тело читается частями в один буфер и хэшируется по мере получения
+                raw = bytearray()
+                hasher = hashlib.sha256()
+                for chunk in response.iter_bytes(chunk_size=stream_chunk_size):
+                    hasher.update(chunk)
+                    raw += chunk
+                meta = {
+                    'url': file_path_or_url,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'sha256': hasher.hexdigest(),
+                }
             try:
-                spec = response.json()
-            except json.JSONDecodeError:
+                spec = orjson.loads(raw)
+            except orjson.JSONDecodeError:
                 print(f"Ответ по URL {file_path_or_url} не содержит допустимый JSON.")
-                return None
+                return None, None
+            content_hash = meta['sha256']
+            if cached_meta and cached_meta.get('sha256') == content_hash:
+                # Содержимое совпадает с уже проверенной сохраненной копией
+                _validated_hashes.add(content_hash)
+                meta['spec_sha256'] = cached_meta.get('spec_sha256')
         else:
-            with open(file_path_or_url, 'r', encoding='utf-8') as file:
-                spec = json.load(file)
+            with open(file_path_or_url, 'rb') as file:
+                raw = file.read()
+            content_hash = hashlib.sha256(raw).hexdigest()
+            meta = {'sha256': content_hash}
+            spec = orjson.loads(raw)
         # Проверка на валидность спецификации Swagger
-        validate_spec(spec)
-        return spec
-    except requests.exceptions.RequestException as e:
+        if validate:
+            validate_spec_cached(spec, content_hash)
+        return spec, meta
+    except httpx.HTTPError as e:
         print(f"Ошибка при загрузке спецификации по URL: {e}")
-        return None
+        return None, None
     except FileNotFoundError:
         print(f"Файл {file_path_or_url} не найден.")
-        return None
-    except json.JSONDecodeError:
+        return None, None
+    except orjson.JSONDecodeError:
         print(f"Файл {file_path_or_url} содержит недопустимый JSON.")
-        return None
+        return None, None
     except SwaggerValidationError as e:
         print(f"Файл {file_path_or_url} содержит недопустимую спецификацию Swagger: {e}")
-        return None
-
-
-def save_spec(spec, directory, base_filename):
-    """Сохраняет спецификацию в JSON файл с временной меткой."""
-    if not os.path.exists(directory):
-        os.makedirs(directory)
-    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-    file_path_with_timestamp = os.path.join(directory, f"{base_filename}_{timestamp}.json")
-    with open(file_path_with_timestamp, 'w', encoding='utf-8') as file:
-        json.dump(spec, file, indent=4)
-
-
-def save_diff(diff, directory, base_filename):
-    """Сохраняет результат сравнения в JSON файл с временной меткой."""
-    if not os.path.exists(directory):
-        os.makedirs(directory)
-    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        return None, None
+
+
+def _ensure_dir(directory):
+    """Создает каталог при необходимости, обращаясь к файловой системе один раз на каталог."""
+    if directory not in _known_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _known_dirs.add(directory)
+
+
+def claim_timestamp(directory, base_filename, timestamp):
+    """Закрепляет за одним URL метку времени для его снимка и различий.
+
+    Метка запуска общая для всех URL, и URL с одинаковым каталогом по умолчанию
+    (например, /svcA/v2/api-docs и /svcB/v2/api-docs) претендуют на одни имена файлов.
+    Если метка уже занята, берется текущее время — при необходимости дожидаемся
+    следующей секунды. Снимок и различия одного URL всегда получают одну метку.
+    """
+    with _claim_lock:
+        while ((directory, base_filename, timestamp) in _claimed_timestamps
+               or os.path.exists(os.path.join(directory, f"{base_filename}_{timestamp}.json"))):
+            time.sleep(0.1)
+            timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        _claimed_timestamps.add((directory, base_filename, timestamp))
+    return timestamp
+
+
+def save_spec(spec, directory, base_filename, meta=None, timestamp=None):
+    """Сохраняет спецификацию в JSON файл с временной меткой (и метаданные ответа рядом).
+
+    Сохраненный снимок добавляется в индекс каталога вместе с sha256 записанных байтов,
+    поэтому хэш в индексе всегда совпадает с хэшем файла.
+    Если метка запуска timestamp не передана, используется текущее время.
+    """
+    _ensure_dir(directory)
+    timestamp = timestamp or datetime.now().strftime('%Y%m%d%H%M%S')
+    filename = f"{base_filename}_{timestamp}.json"
+    file_path_with_timestamp = os.path.join(directory, filename)
+    data = dump_spec(spec)
+    with open(file_path_with_timestamp, 'wb') as file:
+        file.write(data)
+    sha = hashlib.sha256(data).hexdigest()
+    if meta:
+        # spec_sha256 позволяет при неизменном ответе не сериализовать спецификацию повторно
+        save_meta(file_path_with_timestamp, dict(meta, spec_sha256=sha))
+    entry = {'ts': timestamp, 'sha': sha, 'path': filename}
+    with open(os.path.join(directory, index_filename), 'ab') as file:
+        file.write(orjson.dumps(entry) + b'\n')
+
+
+def save_diff(diff, directory, base_filename, human_readable=False, timestamp=None):
+    """Сохраняет результат сравнения в сжатый zstd NDJSON файл с временной меткой.
+
+    При human_readable рядом дополнительно сохраняется форматированный JSON.
+    Если метка запуска timestamp не передана, используется текущее время.
+    """
+    _ensure_dir(directory)
+    timestamp = timestamp or datetime.now().strftime('%Y%m%d%H%M%S')
     file_path_with_timestamp = os.path.join(directory, f"{base_filename}_diff_{timestamp}.json")
-    with open(file_path_with_timestamp, 'w', encoding='utf-8') as file:
-        json.dump(diff, file, indent=4, default=str)
+    compressor = zstd.ZstdCompressor(level=3)
+    with open(file_path_with_timestamp + '.zst', 'wb') as file, compressor.stream_writer(file) as writer:
+        writer.write(orjson.dumps(diff, default=str) + b'\n')
+    if human_readable:
+        with open(file_path_with_timestamp, 'wb') as file:
+            file.write(orjson.dumps(diff, option=orjson.OPT_INDENT_2, default=str))
 
 
 def get_latest_spec_in_range(directory, base_filename, start_time=None, end_time=None):
     """Получает последнюю спецификацию в указанном диапазоне времени или самую свежую."""
     latest_spec = None
-    latest_time = None
+    latest_ts = None
 
     if not os.path.exists(directory):
         return None
 
-    for filename in os.listdir(directory):
-        if filename.startswith(base_filename) and filename.endswith('.json'):
-            timestamp_str = filename[len(base_filename) + 1:-5]
-            try:
-                file_time = datetime.strptime(timestamp_str, '%Y%m%d%H%M%S')
-                if (start_time is None or file_time >= start_time) and (end_time is None or file_time <= end_time):
-                    if latest_time is None or file_time > latest_time:
-                        latest_time = file_time
-                        latest_spec = os.path.join(directory, filename)
-            except ValueError:
+    # Метки времени в именах файлов упорядочены лексикографически,
+    # поэтому границы диапазона сравниваются как строки, без разбора дат
+    start_ts = start_time.strftime('%Y%m%d%H%M%S') if start_time else None
+    end_ts = end_time.strftime('%Y%m%d%H%M%S') if end_time else None
+    prefix_len = len(base_filename) + 1
+
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            if not (name.startswith(base_filename) and name.endswith('.json')):
                 continue
+            timestamp_str = name[prefix_len:-5]
+            # Только имена с меткой вида %Y%m%d%H%M%S (int() пропустил бы знаки, пробелы и '_')
+            if len(timestamp_str) != 14 or not timestamp_str.isdigit():
+                continue
+            if (start_ts is None or timestamp_str >= start_ts) and (end_ts is None or timestamp_str <= end_ts):
+                if latest_ts is None or timestamp_str > latest_ts:
+                    latest_ts = timestamp_str
+                    latest_spec = entry.path
 
     return latest_spec
 
 
-def compare_specs(current_spec, previous_spec):
-    """Сравнивает текущую и предыдущую спецификации."""
-    diff = DeepDiff(previous_spec, current_spec, ignore_order=True)
+def _subtree_hash(obj):
+    """Возвращает хэш канонического (с отсортированными ключами) представления объекта."""
+    return hashlib.blake2b(orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)).digest()
+
+
+def dump_spec(spec):
+    """Сериализует спецификацию в каноническом виде (отсортированные ключи), в котором она сохраняется."""
+    return orjson.dumps(spec, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+
+
+def spec_hash(spec):
+    """Возвращает sha256 канонического представления спецификации (совпадает с хэшем ее файла)."""
+    return hashlib.sha256(dump_spec(spec)).hexdigest()
+
+
+def file_hash(path):
+    """Возвращает sha256 содержимого файла, читая его через mmap без копирования в память процесса."""
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()  # Пустой файл нельзя отобразить в память
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()
+
+
+def _read_lines_reversed(path):
+    """Читает строки файла с конца блоками по stream_chunk_size, не загружая файл целиком."""
+    with open(path, 'rb') as file:
+        position = file.seek(0, os.SEEK_END)
+        tail = b''
+        while position > 0:
+            read_size = min(stream_chunk_size, position)
+            position -= read_size
+            file.seek(position)
+            lines = (file.read(read_size) + tail).split(b'\n')
+            tail = lines.pop(0)  # Начало строки может остаться в предыдущем блоке
+            for line in reversed(lines):
+                if line:
+                    yield line
+        if tail:
+            yield tail
+
+
+def find_indexed_spec(directory, base_filename, start_time=None, end_time=None):
+    """Возвращает последнюю запись индекса в указанном диапазоне времени или самую свежую.
+
+    Индекс читается с конца, и чтение останавливается на первой подходящей записи.
+    Возвращает None, если индекса нет или подходящих записей в нем нет, а также если файл
+    найденной записи уже удален из каталога: индекс устарел, и снимок нужно искать обходом каталога.
+    """
+    start_ts = start_time.strftime('%Y%m%d%H%M%S') if start_time else None
+    end_ts = end_time.strftime('%Y%m%d%H%M%S') if end_time else None
+    try:
+        for line in _read_lines_reversed(os.path.join(directory, index_filename)):
+            try:
+                entry = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue  # Недописанная строка, например после прерванного запуска
+            if entry.get('path') != f"{base_filename}_{entry.get('ts')}.json":
+                continue
+            if (start_ts is None or entry['ts'] >= start_ts) and (end_ts is None or entry['ts'] <= end_ts):
+                return entry if os.path.exists(os.path.join(directory, entry['path'])) else None
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def _ignore_order_for(level):
+    """Разрешает DeepDiff сравнивать без учета порядка только списки из unordered_keys."""
+    path = level.path(output_format='list')
+    return bool(path) and path[-1] in unordered_keys
+
+
+def compare_specs(current_spec, previous_spec, fast_mode=False):
+    """Сравнивает текущую и предыдущую спецификации.
+
+    Совпадающие по хэшу спецификации и разделы верхнего уровня (paths, definitions и т.д.)
+    не передаются в DeepDiff. Без учета порядка сравниваются только списки из unordered_keys:
+    paths, definitions и прочие объекты — словари, и сопоставление пар для них не нужно.
+    В режиме fast_mode сравнение прерывается после max_diffs различий — достаточно,
+    когда нужен лишь признак наличия изменений.
+    """
+    if _subtree_hash(current_spec) == _subtree_hash(previous_spec):
+        return {}
+    unchanged_paths = [
+        f"root[{key!r}]"
+        for key in current_spec.keys() & previous_spec.keys()
+        if _subtree_hash(current_spec[key]) == _subtree_hash(previous_spec[key])
+    ]
+    diff = DeepDiff(
+        previous_spec,
+        current_spec,
+        ignore_order=False,
+        ignore_order_func=_ignore_order_for,
+        exclude_paths=unchanged_paths,
+        # Снимки, сохраненные до проверки копии, содержат x-scope, дописанные валидатором
+        exclude_regex_paths=[r"\['x-scope'\]"],
+        # Ограничиваем кэш и подбор пар элементов для списков без учета порядка
+        cache_size=5000,
+        cache_tuning_sample_size=500,
+        cutoff_intersection_for_pairs=0.6,
+        cutoff_distance_for_pairs=0.6,
+        get_deep_distance=False,
+        iterable_compare_func=None,
+        cache_purge_level=2,
+        max_diffs=1000 if fast_mode else None,
+    )
     return diff
 
 
@@ -99,8 +387,24 @@ def extract_default_directory(url):
     return '.'
 
 
-def process_url(current_spec_url, base_filename, work_dir, start_time=None, end_time=None):
-    """Процесс сравнения для одного URL."""
+def wait_for_validation(validation, current_spec_url):
+    """Дожидается фоновой проверки текущей спецификации; возвращает False, если она невалидна."""
+    try:
+        validation.result()
+        return True
+    except SwaggerValidationError as e:
+        print(f"Текущая спецификация по URL {current_spec_url} содержит недопустимую спецификацию Swagger: {e}. Пропуск.")
+        return False
+
+
+def process_url(current_spec_url, base_filename, work_dir, start_time=None, end_time=None, human_readable=False,
+                run_timestamp=None):
+    """Процесс сравнения для одного URL.
+
+    Снимок и различия получают метку запуска run_timestamp или, если ее уже занял другой
+    URL с тем же каталогом, общую для них метку из claim_timestamp.
+    """
+    run_timestamp = run_timestamp or datetime.now().strftime('%Y%m%d%H%M%S')
     default_directory = extract_default_directory(current_spec_url)
 
     current_spec_directory = os.path.join(work_dir, cur_spec, default_directory)
@@ -110,34 +414,87 @@ def process_url(current_spec_url, base_filename, work_dir, start_time=None, end_
     if base_filename is None:
         base_filename = default_directory
 
-    current_spec = load_spec(current_spec_url)
+    # Индекс позволяет найти снимки и их хэши без обхода каталога и разбора файлов
+    newest_entry = find_indexed_spec(current_spec_directory, base_filename)
+
+    # Самый свежий снимок (без учета диапазона) служит кэшем для условного запроса
+    if newest_entry:
+        cached_spec_path = os.path.join(current_spec_directory, newest_entry['path'])
+    else:
+        cached_spec_path = get_latest_spec_in_range(current_spec_directory, base_filename)
+    current_spec, current_meta = load_spec(current_spec_url, cached_spec_path=cached_spec_path, validate=False)
     if not current_spec:
         print(f"Текущая спецификация по URL {current_spec_url} невалидна. Пропуск.")
         return
+    # Проверка идет в фоне, пока ищется, хэшируется и читается предыдущий снимок;
+    # результат дожидаемся до любого сравнения или сохранения. validate_spec_cached
+    # проверяет копию, поэтому current_spec можно хэшировать параллельно с проверкой
+    validation = _validator_executor.submit(validate_spec_cached, current_spec, current_meta['sha256'])
+    # Хэш канонического представления известен из метаданных, если ответ не изменился
+    current_sha = current_meta.get('spec_sha256') or spec_hash(current_spec)
+
+    previous_entry = find_indexed_spec(current_spec_directory, base_filename, start_time, end_time)
+    if previous_entry:
+        latest_spec_path = os.path.join(current_spec_directory, previous_entry['path'])
+        previous_sha = previous_entry['sha']
+    else:
+        # Снимки, сохраненные до появления индекса, ищем обходом каталога
+        latest_spec_path = get_latest_spec_in_range(current_spec_directory, base_filename, start_time, end_time)
+        previous_sha = file_hash(latest_spec_path) if latest_spec_path else None
+    # Новый снимок не нужен, если самый свежий уже совпадает с текущей спецификацией
+    previous_is_newest = latest_spec_path is not None and latest_spec_path == cached_spec_path
+
+    if previous_sha == current_sha:
+        if not wait_for_validation(validation, current_spec_url):
+            return
+        print(f"Изменений в спецификации по URL {current_spec_url} не найдено.")
+        if previous_is_newest:
+            refresh_meta(latest_spec_path, current_meta)
+        else:
+            timestamp = claim_timestamp(current_spec_directory, base_filename, run_timestamp)
+            save_spec(current_spec, current_spec_directory, base_filename, current_meta, timestamp)
+        return
 
-    latest_spec_path = get_latest_spec_in_range(current_spec_directory, base_filename, start_time, end_time)
-    previous_spec = load_spec(latest_spec_path) if latest_spec_path else None
+    previous_spec, _ = load_spec(latest_spec_path) if latest_spec_path else (None, None)
+    if not wait_for_validation(validation, current_spec_url):
+        return
 
+    timestamp = None  # Метка закрепляется при первом сохранении и общая для различий и снимка
     if previous_spec:
         changes = compare_specs(current_spec, previous_spec)
         if changes:
             print(f"Найдены изменения в спецификации по URL {current_spec_url}:")
-            save_diff(changes, diff_directory, base_filename)
+            timestamp = claim_timestamp(current_spec_directory, base_filename, run_timestamp)
+            save_diff(changes, diff_directory, base_filename, human_readable, timestamp)
         else:
             print(f"Изменений в спецификации по URL {current_spec_url} не найдено.")
+            if previous_is_newest:
+                refresh_meta(latest_spec_path, current_meta)
+                return
     else:
         print(f"Предыдущая спецификация по URL {current_spec_url} не найдена или невалидна. Создается новый файл.")
 
-    save_spec(current_spec, current_spec_directory, base_filename)
+    timestamp = timestamp or claim_timestamp(current_spec_directory, base_filename, run_timestamp)
+    save_spec(current_spec, current_spec_directory, base_filename, current_meta, timestamp)
 
 
-def main(urls_file, work_dir='.', base_filename=None, start_time=None, end_time=None):
+def main(urls_file, work_dir='.', base_filename=None, start_time=None, end_time=None, human_readable=False):
     """Основная функция для загрузки, сравнения и сохранения спецификаций для нескольких URL."""
     with open(urls_file, 'r', encoding='utf-8') as file:
-        urls = [line.strip() for line in file if line.strip()]
+        lines = file.read().splitlines()
+    # dict.fromkeys убирает повторяющиеся URL, сохраняя порядок
+    urls = list(dict.fromkeys(line.strip() for line in lines if line.strip()))
+    # Одна метка времени на запуск: снимки и различия одного запуска легко сопоставить
+    run_timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+
+    warm_up_validator()
 
-    for url in urls:
-        process_url(url, base_filename, work_dir, start_time, end_time)
+    # Загрузка упирается в сеть, поэтому URL обрабатываются параллельно
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(
+            lambda url: process_url(url, base_filename, work_dir, start_time, end_time, human_readable, run_timestamp),
+            urls,
+        ))
 
 
 if __name__ == "__main__":
@@ -153,4 +510,7 @@ if __name__ == "__main__":
     # Указываем рабочую директорию (например, "C:\\results")
     work_dir = "C:\\results"
 
-    main(urls_file, work_dir)
+    # С флагом --human различия дополнительно сохраняются в читаемом JSON
+    human_readable = '--human' in sys.argv[1:]
+
+    main(urls_file, work_dir, human_readable=human_readable)